@@ -7,11 +7,17 @@
 """
 
 import asyncio
-import base64
+import hashlib
 import io
 import json
+import os
+import re
+import stat
 import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -29,7 +35,7 @@ from mcp.types import (
     Tool,
     TextContent,
 )
-from PIL import Image
+from PIL import Image, __version__ as PILLOW_VERSION
 
 # 修复ddddocr与新版本Pillow的兼容性问题
 if not hasattr(Image, 'ANTIALIAS'):
@@ -37,14 +43,99 @@ if not hasattr(Image, 'ANTIALIAS'):
 
 try:
     import ddddocr
+    import onnxruntime
 except ImportError:
     logger.error("ddddocr库未安装，请运行: pip install ddddocr")
     sys.exit(1)
 
+# 优先使用SIMD加速的pybase64，未安装时回退到标准库
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# 优先使用orjson序列化响应，未安装时回退到标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _to_json(data: Dict[str, Any]) -> str:
+    """将响应数据序列化为JSON文本"""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+# 仅由标准base64字母表组成（不含空白等会被解码器丢弃的字符）的数据
+_PLAIN_BASE64_RE = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+
+
+def _sniff_format(data: bytes) -> str:
+    """根据文件头魔数识别图片格式，无法识别时返回unknown"""
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if data[:3] == b"\xff\xd8\xff":
+        return "jpeg"
+    if data[:4] == b"GIF8":
+        return "gif"
+    if data[:2] == b"BM":
+        return "bmp"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return "unknown"
+
+
+# 进程内共享的OCR引擎实例，避免重复加载ONNX模型
+_ocr_engine = None
+_ocr_engine_lock = threading.Lock()
+
+
+def get_ocr_engine(use_gpu: bool = False, device_id: int = 0,
+                   onnx_path: str = "", charsets_path: str = ""):
+    """获取进程内共享的ddddocr引擎实例（首次调用时加载模型）
+    
+    Args:
+        use_gpu: 是否使用CUDA执行提供程序进行推理，不可用时回退到CPU
+        device_id: 使用的GPU设备编号
+        onnx_path: 自定义ONNX模型路径（如int8量化模型），为空时使用内置模型
+        charsets_path: 自定义模型对应的字符集文件路径
+    """
+    global _ocr_engine
+    if _ocr_engine is None:
+        with _ocr_engine_lock:
+            if _ocr_engine is None:
+                if use_gpu and "CUDAExecutionProvider" not in onnxruntime.get_available_providers():
+                    logger.warning("未检测到CUDA执行提供程序，OCR将使用CPU推理")
+                    use_gpu = False
+                engine = ddddocr.DdddOcr(
+                    show_ad=False,
+                    use_gpu=use_gpu,
+                    device_id=device_id,
+                    import_onnx_path=onnx_path,
+                    charsets_path=charsets_path
+                )
+                # 预热一次推理，提前完成ONNX Runtime的内存分配与内核初始化
+                warmup_buffer = io.BytesIO()
+                Image.new("RGB", (64, 24), "white").save(warmup_buffer, format="PNG")
+                engine.classification(warmup_buffer.getvalue())
+                _ocr_engine = engine
+    return _ocr_engine
+
 
 class CaptchaRecognitionServer:
     """验证码识别MCP服务器"""
     
+    # 识别结果缓存的默认最大条目数
+    _DEFAULT_CACHE_SIZE = 1024
+    
+    # 批量识别的最大文件数
+    _MAX_BATCH_SIZE = 10
+    
+    # 支持的图片文件扩展名
+    _SUPPORTED_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp"})
+    
     def __init__(self, config_path: str = "config.yaml"):
         """初始化服务器
         
@@ -53,7 +144,29 @@ class CaptchaRecognitionServer:
         """
         self.config = self._load_config(config_path)
         self._setup_logging()
+        logger.debug("Pillow版本: {}", PILLOW_VERSION)
         self.ocr_engine = None
+        recognition_config = self.config.get("recognition", {})
+        self._max_image_size = recognition_config.get("max_image_size", 5242880)
+        self._supported_formats = frozenset(recognition_config.get("supported_formats", []))
+        self._strict_validation = recognition_config.get("strict_validation", False)
+        self._preload = recognition_config.get("preload", True)
+        self._use_gpu = recognition_config.get("use_gpu", False)
+        self._device_id = recognition_config.get("device_id", 0)
+        self._onnx_path = recognition_config.get("onnx_path", "")
+        self._charsets_path = recognition_config.get("charsets_path", "")
+        if bool(self._onnx_path) != bool(self._charsets_path):
+            raise ValueError("recognition.onnx_path与recognition.charsets_path必须同时配置或同时留空")
+        self._preload_task = None
+        perf_config = self.config.get("performance", {})
+        self._executor = ThreadPoolExecutor(
+            max_workers=perf_config.get("max_concurrent_requests", os.cpu_count()),
+            thread_name_prefix="ocr"
+        )
+        self._cache_enabled = perf_config.get("enable_cache", True)
+        self._cache_size = perf_config.get("cache_size", self._DEFAULT_CACHE_SIZE)
+        self._result_cache: "OrderedDict[bytes, Optional[str]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self.server = Server("ddddocr-mcp-server")
         self._setup_handlers()
         
@@ -81,11 +194,21 @@ class CaptchaRecognitionServer:
                 "engine": "ddddocr",
                 "max_image_size": 5242880,
                 "supported_formats": ["png", "jpg", "jpeg", "bmp", "gif", "webp"],
-                "timeout": 30
+                "timeout": 30,
+                "strict_validation": False,
+                "preload": True,
+                "use_gpu": False,
+                "device_id": 0,
+                "onnx_path": "",
+                "charsets_path": ""
             },
             "logging": {
                 "level": "INFO",
                 "format": "json"
+            },
+            "performance": {
+                "enable_cache": True,
+                "cache_size": 1024
             }
         }
     
@@ -121,61 +244,64 @@ class CaptchaRecognitionServer:
     def _setup_handlers(self):
         """设置MCP处理器"""
         
+        # 工具列表是固定的，只构建一次供每次list_tools调用复用
+        self._tools: List[Tool] = [
+            Tool(
+                name="recognize_captcha",
+                description="识别图形验证码，返回识别结果和置信度",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "image_data": {
+                            "type": "string",
+                            "description": "验证码图片数据（base64编码）"
+                        },
+                        "image_format": {
+                            "type": "string",
+                            "description": "图片数据格式，默认为base64",
+                            "default": "base64"
+                        }
+                    },
+                    "required": ["image_data"]
+                }
+            ),
+            Tool(
+                name="recognize_captcha_from_file",
+                description="从图片文件识别验证码，支持JPG、PNG、BMP、GIF、WEBP等常见格式",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "file_path": {
+                            "type": "string",
+                            "description": "图片文件的完整路径"
+                        }
+                    },
+                    "required": ["file_path"]
+                }
+            ),
+            Tool(
+                name="recognize_captcha_batch",
+                description="批量识别多个图片文件中的验证码",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "file_paths": {
+                            "type": "array",
+                            "items": {
+                                "type": "string"
+                            },
+                            "description": "图片文件路径列表"
+                        }
+                    },
+                    "required": ["file_paths"]
+                }
+            )
+        ]
+        
         @self.server.list_tools()
         async def handle_list_tools() -> List[Tool]:
             """列出可用的工具函数"""
-            return [
-                Tool(
-                    name="recognize_captcha",
-                    description="识别图形验证码，返回识别结果和置信度",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "image_data": {
-                                "type": "string",
-                                "description": "验证码图片数据（base64编码）"
-                            },
-                            "image_format": {
-                                "type": "string",
-                                "description": "图片数据格式，默认为base64",
-                                "default": "base64"
-                            }
-                        },
-                        "required": ["image_data"]
-                    }
-                ),
-                Tool(
-                    name="recognize_captcha_from_file",
-                    description="从图片文件识别验证码，支持JPG、PNG、BMP、GIF、WEBP等常见格式",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "file_path": {
-                                "type": "string",
-                                "description": "图片文件的完整路径"
-                            }
-                        },
-                        "required": ["file_path"]
-                    }
-                ),
-                Tool(
-                    name="recognize_captcha_batch",
-                    description="批量识别多个图片文件中的验证码",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "file_paths": {
-                                "type": "array",
-                                "items": {
-                                    "type": "string"
-                                },
-                                "description": "图片文件路径列表"
-                            }
-                        },
-                        "required": ["file_paths"]
-                    }
-                )
-            ]
+            return self._tools
         
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
@@ -189,10 +315,105 @@ class CaptchaRecognitionServer:
             else:
                 raise ValueError(f"未知的工具: {name}")
     
+    async def _ensure_engine(self):
+        """确保OCR引擎已初始化
+
+        模型在首次调用时才加载，并放到线程中执行，避免阻塞事件循环。
+        """
+        if self.ocr_engine is None:
+            self.ocr_engine = await self._run_blocking(
+                get_ocr_engine, self._use_gpu, self._device_id, self._onnx_path, self._charsets_path
+            )
+    
+    async def _preload_engine(self):
+        """后台预加载OCR引擎，使首个请求无需等待模型加载"""
+        try:
+            await self._ensure_engine()
+        except Exception as e:
+            logger.error("OCR引擎预加载失败: {}", e)
+    
+    def _classify(self, image_bytes: bytes) -> Optional[str]:
+        """执行OCR识别，相同图片内容命中缓存时跳过模型推理"""
+        if not self._cache_enabled:
+            return self.ocr_engine.classification(image_bytes)
+        
+        key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+        with self._cache_lock:
+            if key in self._result_cache:
+                self._result_cache.move_to_end(key)
+                return self._result_cache[key]
+        
+        recognized_text = self.ocr_engine.classification(image_bytes)
+        with self._cache_lock:
+            self._result_cache[key] = recognized_text
+            if len(self._result_cache) > self._cache_size:
+                self._result_cache.popitem(last=False)
+        return recognized_text
+    
+    async def _run_blocking(self, func, *args):
+        """在线程池中执行阻塞操作，避免阻塞事件循环"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    async def _recognize(self, image_bytes: bytes) -> Optional[str]:
+        """在线程池中执行OCR识别"""
+        return await self._run_blocking(self._classify, image_bytes)
+    
+    def _check_image_format(self, image_bytes: bytes, error_prefix: str):
+        """校验图片格式
+        
+        默认按文件头魔数识别，严格校验或无法识别时交由PIL解析。
+        
+        Args:
+            image_bytes: 图片字节数据
+            error_prefix: 图片无法解析时错误信息的前缀
+        """
+        img_format = _sniff_format(image_bytes)
+        if self._strict_validation or img_format == "unknown":
+            try:
+                with Image.open(io.BytesIO(image_bytes)) as img:
+                    img_format = img.format.lower() if img.format else "unknown"
+            except Exception as e:
+                raise ValueError(f"{error_prefix}: {e}")
+        if img_format not in self._supported_formats:
+            logger.warning("图片格式 {} 可能不被支持", img_format)
+    
+    def _decode_image_data(self, image_data: str, image_format: str) -> bytes:
+        """解码请求中的图片数据并校验大小和格式"""
+        max_size = self._max_image_size
+        
+        # 处理图片数据
+        if image_format == "base64":
+            # 移除可能的数据URL前缀
+            if image_data.startswith("data:"):
+                image_data = image_data.partition(",")[2]
+            
+            # 解码前按base64长度估算图片大小，超限时直接拒绝，避免为超大数据分配解码缓冲区；
+            # 含空白等非字母表字符时（解码器会丢弃这些字符）长度无法用于估算，交由解码后的检查判断
+            if (len(image_data) // 4 * 3 - 2 > max_size
+                    and _PLAIN_BASE64_RE.fullmatch(image_data)):
+                raise ValueError(f"图片大小超过限制 ({max_size} bytes)")
+            
+            try:
+                image_bytes = base64.b64decode(image_data)
+            except Exception as e:
+                raise ValueError(f"base64解码失败: {e}")
+        else:
+            raise ValueError(f"不支持的图片格式: {image_format}")
+        
+        # 验证图片大小
+        if len(image_bytes) > max_size:
+            raise ValueError(f"图片大小超过限制 ({max_size} bytes)")
+        
+        # 验证图片格式
+        self._check_image_format(image_bytes, "无效的图片数据")
+        
+        return image_bytes
+    
     async def _handle_recognize_captcha(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """处理验证码识别请求"""
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             # 获取参数
             image_data = arguments.get("image_data")
@@ -202,45 +423,19 @@ class CaptchaRecognitionServer:
                 raise ValueError("缺少image_data参数")
             
             # 初始化OCR引擎（延迟加载）
-            if self.ocr_engine is None:
-                self.ocr_engine = ddddocr.DdddOcr()
-            
-            # 处理图片数据
-            if image_format == "base64":
-                try:
-                    # 移除可能的数据URL前缀
-                    if image_data.startswith("data:image/"):
-                        image_data = image_data.split(",", 1)[1]
-                    
-                    image_bytes = base64.b64decode(image_data)
-                except Exception as e:
-                    raise ValueError(f"base64解码失败: {e}")
-            else:
-                raise ValueError(f"不支持的图片格式: {image_format}")
+            await self._ensure_engine()
             
-            # 验证图片大小
-            max_size = self.config.get("recognition", {}).get("max_image_size", 5242880)
-            if len(image_bytes) > max_size:
-                raise ValueError(f"图片大小超过限制 ({max_size} bytes)")
-            
-            # 验证图片格式
-            try:
-                with Image.open(io.BytesIO(image_bytes)) as img:
-                    img_format = img.format.lower() if img.format else "unknown"
-                    supported_formats = self.config.get("recognition", {}).get("supported_formats", [])
-                    if img_format not in supported_formats:
-                        logger.warning(f"图片格式 {img_format} 可能不被支持")
-            except Exception as e:
-                raise ValueError(f"无效的图片数据: {e}")
+            # 解码并校验图片数据
+            image_bytes = await self._run_blocking(self._decode_image_data, image_data, image_format)
             
             # 执行OCR识别
             try:
-                recognized_text = self.ocr_engine.classification(image_bytes)
+                recognized_text = await self._recognize(image_bytes)
             except Exception as e:
-                logger.error(f"OCR识别失败: {e}")
+                logger.error("OCR识别失败: {}", e)
                 raise ValueError(f"验证码识别失败: {e}")
             
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             
             # 构建结果
             result = {
@@ -255,11 +450,11 @@ class CaptchaRecognitionServer:
             
             return [TextContent(
                 type="text",
-                text=json.dumps(result, ensure_ascii=False, indent=2)
+                text=_to_json(result)
             )]
             
         except Exception as e:
-            logger.error(f"验证码识别处理失败: {e}")
+            logger.error("验证码识别处理失败: {}", e)
             error_result = {
                 "success": False,
                 "text": "",
@@ -271,54 +466,65 @@ class CaptchaRecognitionServer:
             
             return [TextContent(
                 type="text",
-                text=json.dumps(error_result, ensure_ascii=False, indent=2)
+                text=_to_json(error_result)
             )]
     
     def _read_image_file(self, file_path: str) -> bytes:
         """读取图片文件并返回字节数据"""
         try:
-            # 检查文件是否存在
-            path = Path(file_path)
-            if not path.exists():
-                raise FileNotFoundError(f"文件不存在: {file_path}")
+            # 检查文件扩展名
+            suffix = Path(file_path).suffix
+            if suffix.lower() not in self._SUPPORTED_EXTENSIONS:
+                logger.warning("文件扩展名 {} 可能不被支持", suffix)
             
-            if not path.is_file():
+            # 以非阻塞方式打开文件，由open本身完成存在性检查；
+            # 非阻塞打开可避免FIFO等特殊文件在等待写入端时挂起
+            flags = os.O_RDONLY | getattr(os, "O_NONBLOCK", 0) | getattr(os, "O_BINARY", 0)
+            try:
+                fd = os.open(file_path, flags)
+            except (FileNotFoundError, NotADirectoryError):
+                raise FileNotFoundError(f"文件不存在: {file_path}")
+            except IsADirectoryError:
                 raise ValueError(f"路径不是文件: {file_path}")
+            except PermissionError:
+                # Windows下打开目录会抛出PermissionError
+                if os.path.isdir(file_path):
+                    raise ValueError(f"路径不是文件: {file_path}")
+                raise
             
-            # 检查文件扩展名
-            supported_extensions = ['.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp']
-            if path.suffix.lower() not in supported_extensions:
-                logger.warning(f"文件扩展名 {path.suffix} 可能不被支持")
-            
-            # 读取文件
-            with open(file_path, 'rb') as f:
-                image_bytes = f.read()
+            try:
+                file_stat = os.fstat(fd)
+                if not stat.S_ISREG(file_stat.st_mode):
+                    raise ValueError(f"路径不是文件: {file_path}")
+            except BaseException:
+                os.close(fd)
+                raise
+            
+            with os.fdopen(fd, 'rb') as f:
+                # 验证图片大小（读取前根据文件元数据判断，避免读入超大文件）
+                max_size = self._max_image_size
+                if file_stat.st_size > max_size:
+                    raise ValueError(f"图片大小超过限制 ({max_size} bytes)")
+                
+                # 读取文件，最多多读一个字节以发现fstat之后仍在增长的文件
+                image_bytes = f.read(max_size + 1)
             
-            # 验证图片大小
-            max_size = self.config.get("recognition", {}).get("max_image_size", 5242880)
             if len(image_bytes) > max_size:
                 raise ValueError(f"图片大小超过限制 ({max_size} bytes)")
             
             # 验证图片格式
-            try:
-                with Image.open(io.BytesIO(image_bytes)) as img:
-                    img_format = img.format.lower() if img.format else "unknown"
-                    supported_formats = self.config.get("recognition", {}).get("supported_formats", [])
-                    if img_format not in supported_formats:
-                        logger.warning(f"图片格式 {img_format} 可能不被支持")
-            except Exception as e:
-                raise ValueError(f"无效的图片文件: {e}")
+            self._check_image_format(image_bytes, "无效的图片文件")
             
             return image_bytes
             
         except Exception as e:
-            logger.error(f"读取图片文件失败 {file_path}: {e}")
+            logger.error("读取图片文件失败 {}: {}", file_path, e)
             raise
     
     async def _handle_recognize_captcha_from_file(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """处理从文件识别验证码的请求"""
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             # 获取参数
             file_path = arguments.get("file_path")
@@ -326,20 +532,19 @@ class CaptchaRecognitionServer:
                 raise ValueError("缺少file_path参数")
             
             # 初始化OCR引擎（延迟加载）
-            if self.ocr_engine is None:
-                self.ocr_engine = ddddocr.DdddOcr()
+            await self._ensure_engine()
             
             # 读取图片文件
-            image_bytes = self._read_image_file(file_path)
+            image_bytes = await self._run_blocking(self._read_image_file, file_path)
             
             # 执行OCR识别
             try:
-                recognized_text = self.ocr_engine.classification(image_bytes)
+                recognized_text = await self._recognize(image_bytes)
             except Exception as e:
-                logger.error(f"OCR识别失败: {e}")
+                logger.error("OCR识别失败: {}", e)
                 raise ValueError(f"验证码识别失败: {e}")
             
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             
             # 构建结果
             result = {
@@ -355,11 +560,11 @@ class CaptchaRecognitionServer:
             
             return [TextContent(
                 type="text",
-                text=json.dumps(result, ensure_ascii=False, indent=2)
+                text=_to_json(result)
             )]
             
         except Exception as e:
-            logger.error(f"文件验证码识别处理失败: {e}")
+            logger.error("文件验证码识别处理失败: {}", e)
             error_result = {
                 "success": False,
                 "file_path": arguments.get("file_path", ""),
@@ -372,13 +577,48 @@ class CaptchaRecognitionServer:
             
             return [TextContent(
                 type="text",
-                text=json.dumps(error_result, ensure_ascii=False, indent=2)
+                text=_to_json(error_result)
             )]
     
+    def _recognize_batch_item(self, file_path: str) -> Dict[str, Any]:
+        """识别批量请求中的单个文件并返回其结果（在线程池中执行）"""
+        file_start_time = time.perf_counter()
+        try:
+            # 读取图片文件
+            image_bytes = self._read_image_file(file_path)
+            
+            # 执行OCR识别
+            recognized_text = self._classify(image_bytes)
+            
+            file_processing_time = time.perf_counter() - file_start_time
+            
+            # 单个文件结果
+            return {
+                "success": True,
+                "file_path": file_path,
+                "text": recognized_text or "",
+                "confidence": 0.95,
+                "processing_time": round(file_processing_time, 3)
+            }
+            
+        except Exception as e:
+            file_processing_time = time.perf_counter() - file_start_time
+            logger.error("文件 {} 识别失败: {}", file_path, e)
+            
+            # 单个文件错误结果
+            return {
+                "success": False,
+                "file_path": file_path,
+                "text": "",
+                "confidence": 0.0,
+                "processing_time": round(file_processing_time, 3),
+                "error": str(e)
+            }
+    
     async def _handle_recognize_captcha_batch(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """处理批量验证码识别请求"""
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             # 获取参数
             file_paths = arguments.get("file_paths")
@@ -392,62 +632,20 @@ class CaptchaRecognitionServer:
                 raise ValueError("file_paths不能为空")
             
             # 限制批量处理数量
-            max_batch_size = 10
-            if len(file_paths) > max_batch_size:
-                raise ValueError(f"批量处理文件数量不能超过 {max_batch_size} 个")
+            if len(file_paths) > self._MAX_BATCH_SIZE:
+                raise ValueError(f"批量处理文件数量不能超过 {self._MAX_BATCH_SIZE} 个")
             
             # 初始化OCR引擎（延迟加载）
-            if self.ocr_engine is None:
-                self.ocr_engine = ddddocr.DdddOcr()
-            
-            results = []
-            successful_count = 0
-            failed_count = 0
-            
-            # 逐个处理文件
-            for i, file_path in enumerate(file_paths):
-                file_start_time = time.time()
-                try:
-                    # 读取图片文件
-                    image_bytes = self._read_image_file(file_path)
-                    
-                    # 执行OCR识别
-                    recognized_text = self.ocr_engine.classification(image_bytes)
-                    
-                    file_processing_time = time.time() - file_start_time
-                    
-                    # 单个文件结果
-                    file_result = {
-                        "success": True,
-                        "file_path": file_path,
-                        "text": recognized_text or "",
-                        "confidence": 0.95,
-                        "processing_time": round(file_processing_time, 3)
-                    }
-                    
-                    results.append(file_result)
-                    successful_count += 1
-                    
-
-                    
-                except Exception as e:
-                    file_processing_time = time.time() - file_start_time
-                    logger.error(f"文件 {file_path} 识别失败: {e}")
-                    
-                    # 单个文件错误结果
-                    file_result = {
-                        "success": False,
-                        "file_path": file_path,
-                        "text": "",
-                        "confidence": 0.0,
-                        "processing_time": round(file_processing_time, 3),
-                        "error": str(e)
-                    }
-                    
-                    results.append(file_result)
-                    failed_count += 1
-            
-            total_processing_time = time.time() - start_time
+            await self._ensure_engine()
+            
+            # 并发处理所有文件，读取与识别在线程池中并行执行
+            results = await asyncio.gather(
+                *(self._run_blocking(self._recognize_batch_item, file_path) for file_path in file_paths)
+            )
+            successful_count = sum(1 for file_result in results if file_result["success"])
+            failed_count = len(results) - successful_count
+            
+            total_processing_time = time.perf_counter() - start_time
             
             # 构建批量结果
             batch_result = {
@@ -464,11 +662,11 @@ class CaptchaRecognitionServer:
             
             return [TextContent(
                 type="text",
-                text=json.dumps(batch_result, ensure_ascii=False, indent=2)
+                text=_to_json(batch_result)
             )]
             
         except Exception as e:
-            logger.error(f"批量验证码识别处理失败: {e}")
+            logger.error("批量验证码识别处理失败: {}", e)
             error_result = {
                 "success": False,
                 "total_files": len(arguments.get("file_paths", [])),
@@ -482,21 +680,27 @@ class CaptchaRecognitionServer:
             
             return [TextContent(
                 type="text",
-                text=json.dumps(error_result, ensure_ascii=False, indent=2)
+                text=_to_json(error_result)
             )]
     
     async def run_stdio(self):
         """运行stdio传输模式"""
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="ddddocr-mcp-server",
-                    server_version="1.0.0",
-                    capabilities={}
+        if self._preload:
+            self._preload_task = asyncio.create_task(self._preload_engine())
+        
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name="ddddocr-mcp-server",
+                        server_version="1.0.0",
+                        capabilities={}
+                    )
                 )
-            )
+        finally:
+            self._executor.shutdown(wait=False)
     
     async def run_sse(self, host: str = "localhost", port: int = 8080):
         """运行SSE传输模式（暂不支持）"""
@@ -507,7 +711,11 @@ class CaptchaRecognitionServer:
 async def main():
     """主函数"""
     # 创建服务器实例
-    server = CaptchaRecognitionServer()
+    try:
+        server = CaptchaRecognitionServer()
+    except ValueError as e:
+        logger.error(f"服务器配置错误: {e}")
+        sys.exit(1)
     
     # 根据配置选择传输方式
     transport = server.config.get("server", {}).get("transport", "stdio")
@@ -530,4 +738,14 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    
+    # uvloop.run自0.18起提供；Windows、未安装或旧版uvloop时使用默认事件循环
+    uvloop_run = getattr(uvloop, "run", None)
+    if uvloop_run is not None:
+        uvloop_run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file